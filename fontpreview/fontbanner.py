@@ -39,7 +39,7 @@ def resize(image, bg_image):
     """
     # Check size of background image
     new_size = image.size
-    while new_size > bg_image.size:
+    while new_size[0] > bg_image.width or new_size[1] > bg_image.height:
         width, height = new_size
         new_size = (int(width // 1.2), int(height // 1.2))
     # Resize image
@@ -160,7 +160,7 @@ class FontBanner(FontPreview):
         else:
             img = Image.open(image)
         # Check if the image is bigger than the banner
-        if img.size > self.dimension:
+        if img.width > self.dimension[0] or img.height > self.dimension[1]:
             img = resize(img, self.image)
         # Add image
         self.image.paste(img, position)
@@ -22,7 +22,8 @@
 
 # region imports
 import os
-from .fontpreview import FontPreview, CALC_POSITION
+from concurrent.futures import ThreadPoolExecutor
+from .fontpreview import FontPreview, calc_position, _get_size
 from .fontbanner import FontLogo
 from PIL import Image, ImageDraw
 
@@ -46,11 +47,11 @@ class FontPage:
         :param body: body of fontpage object
         :param footer: footer of fontpage object
         """
+        # Check if the template is specified
+        if template is None:
+            template = FontPageTemplate(dimension[1])
         self.template = template
-        if self.template:
-            self.dimension = (dimension[0], self.template.page_height)
-        else:
-            self.dimension = dimension
+        self.dimension = (dimension[0], self.template.page_height)
         self.color_system = 'RGB'
         self.page = Image.new(self.color_system, self.dimension, color='white')
         # Set header
@@ -86,36 +87,46 @@ class FontPage:
         """
         Dynamically compose the page
 
-        :return: None
-        """
-        # Check if the template is specified
-        if not self.template:
-            self.template = FontPageTemplate(self.dimension[1])
-        # Check height of each part
-        try:
-            # Compose background
-            self.dimension = (self.dimension[0], self.template.page_height)
-            self.page = Image.new(self.color_system, self.dimension, color='white')
-            # Compose header
-            self.set_header(self.header)
-            if self.header.image.height != self.template.header_units:
-                self.header.dimension = (self.page.width, self.template.header_units)
-            self.header.set_font_size(self.template.header_font_size)
-            self.header.set_text_position(self.template.header_text_position)
-            # Compose body
-            self.set_body(self.body)
-            if self.body.image.height != self.template.body_units:
-                self.body.dimension = (self.page.width, self.template.body_units)
-            self.body.set_font_size(self.template.body_font_size)
-            self.body.set_text_position(self.template.body_text_position)
-            # Compose footer
-            self.set_footer(self.footer)
-            if self.footer.image.height != self.template.footer_units:
-                self.footer.dimension = (self.page.width, self.template.footer_units)
-            self.footer.set_font_size(self.template.footer_font_size)
-            self.footer.set_text_position(self.template.footer_text_position)
-        except AttributeError:
-            raise AttributeError('header, body and footer is mandatory object')
+        :return: tuple of header, body and footer images
+        """
+        template = self.template
+        width = self.dimension[0]
+        self.dimension = (width, template.page_height)
+        # Compose header, body and footer with the final geometry; each part is drawn once on paste
+        parts = (
+            ('header', self.header, template.header_units,
+             template.header_font_size, template.header_text_position),
+            ('body', self.body, template.body_units,
+             template.body_font_size, template.body_text_position),
+            ('footer', self.footer, template.footer_units,
+             template.footer_font_size, template.footer_text_position),
+        )
+        for name, part, units, font_size, text_position in parts:
+            # Check if part is FontPreview object
+            if not isinstance(part, FontPreview):
+                raise ValueError('{0} must be FontPreview based object, not {1}'.format(name, part))
+            part.reconfigure(dimension=(width, units), font_size=font_size, text_position=text_position)
+        # Each part is rendered again only if its properties changed
+        images = (self.header.image, self.body.image, self.footer.image)
+        # Compose background; white fill is needed only if the parts don't cover the whole page
+        covered = self.__is_covered(images)
+        if self.page is None or self.page.size != self.dimension or self.page.mode != self.color_system:
+            # No white fill when covered; every pixel is overwritten by the parts
+            self.page = Image.new(self.color_system, self.dimension, color=None if covered else 'white')
+        elif not covered:
+            # Reuse the image of previous draw
+            self.page.paste('white', (0, 0) + self.dimension)
+        return images
+
+    def __is_covered(self, images):
+        """
+        Check if the images of the parts, stacked vertically, cover the whole page
+
+        :param images: images of header, body and footer
+        :return: bool
+        """
+        return (all(image.width >= self.dimension[0] for image in images)
+                and sum(image.height for image in images) >= self.dimension[1])
 
     def set_header(self, header):
         """
@@ -127,13 +138,21 @@ class FontPage:
         # Check if header is FontPreview object
         if isinstance(header, FontPreview):
             # Check width of header
-            if self.page.width != header.image.width:
-                header.dimension = (self.page.width, header.image.height)
-                header.draw()
+            self.__fit_width(header)
             self.header = header
         else:
             raise ValueError('header must be FontPreview based object, not {0}'.format(header))
 
+    def __fit_width(self, part):
+        """
+        Fit the width of a part to the page; the part is drawn on next access of its image
+
+        :param part: FontPreview object
+        :return: None
+        """
+        if self.page.width != part.dimension[0]:
+            part.reconfigure(dimension=(self.page.width, part.dimension[1]))
+
     def set_logo(self, logo):
         """
         Set logo of Font page
@@ -146,11 +165,11 @@ class FontPage:
             # Check if header exists
             if self.header:
                 # Check size of header
-                if self.header.image.size < logo.image.size:
+                if self.header.image.width < logo.image.width or self.header.image.height < logo.image.height:
                     logo.new_size((75, 75))
                 # Add logo on header
-                self.header.add_image(logo, CALC_POSITION['lcenter'](self.header.dimension,
-                                                                     self.header.font.getsize(self.header.font_text)))
+                text_size = _get_size(self.header.font.path, self.header.font.size, self.header.font_text)
+                self.header.add_image(logo, calc_position('lcenter', self.header.dimension, text_size))
             else:
                 raise AttributeError('header attribute is None')
         else:
@@ -166,9 +185,7 @@ class FontPage:
         # Check if body is FontPreview object
         if isinstance(body, FontPreview):
             # Check width of body
-            if self.page.width != body.image.width:
-                body.dimension = (self.page.width, body.image.height)
-                body.draw()
+            self.__fit_width(body)
             self.body = body
         else:
             raise ValueError('body must be FontPreview based object, not {0}'.format(body))
@@ -183,13 +200,23 @@ class FontPage:
         # Check if footer is FontPreview object
         if isinstance(footer, FontPreview):
             # Check width of footer
-            if self.page.width != footer.image.width:
-                footer.dimension = (self.page.width, footer.image.height)
-                footer.draw()
+            self.__fit_width(footer)
             self.footer = footer
         else:
             raise ValueError('footer must be FontPreview based object, not {0}'.format(footer))
 
+    def __paste(self, image, start):
+        """
+        Paste an image on the page with an explicit box, converting it to the page color system if needed
+
+        :param image: Image object
+        :param start: x and y axis of top left corner
+        :return: None
+        """
+        if image.mode != self.color_system:
+            image = image.convert(self.color_system)
+        self.page.paste(image, (start[0], start[1], start[0] + image.width, start[1] + image.height))
+
     def draw(self, separator=True, sep_color='black', sep_width=5):
         """
         Draw font page with header, logo, body and footer
@@ -199,32 +226,31 @@ class FontPage:
         :param sep_width: separator width
         :return: None
         """
-        # Compose all parts
-        self.__compose()
-        header_start = (0, 0)
-        self.page.paste(self.header.image, header_start)
-        body_start = (0, self.header.image.height)
-        self.page.paste(self.body.image, body_start)
-        footer_start = (0, (self.body.image.height + self.header.image.height))
-        self.page.paste(self.footer.image, footer_start)
+        # Compose all parts and stack them into the page
+        starts = []
+        top = 0
+        for image in self.__compose():
+            starts.append((0, top))
+            self.__paste(image, starts[-1])
+            top += image.height
         # Draw line
         if separator:
             draw = ImageDraw.Draw(self.page)
-            # Header/Body line
-            body_finish = (self.page.width, self.header.image.height)
-            draw.line([body_start, body_finish], fill=sep_color, width=sep_width)
-            # Body/Footer line
-            footer_finish = (self.page.width, self.body.image.height + self.header.image.height)
-            draw.line([footer_start, footer_finish], fill=sep_color, width=sep_width)
+            # Header/Body and Body/Footer line
+            for start in starts[1:]:
+                draw.line([start, (self.page.width, start[1])], fill=sep_color, width=sep_width)
 
-    def save(self, path=os.path.join(os.path.abspath(os.getcwd()), 'fontpage.png')):
+    def save(self, path=os.path.join(os.path.abspath(os.getcwd()), 'fontpage.png'), compress_level=6, optimize=False):
         """
         Save the font page
 
         :param path: path where you want to save the font page
+        :param compress_level: PNG compression level, from 0 (no compression, fastest) to 9 (smallest file).
+            Default is 6. Ignored by other formats.
+        :param optimize: search the best PNG compression; smaller file but slower save. Default is False.
         :return: None
         """
-        self.page.save(path)
+        self.page.save(path, compress_level=compress_level, optimize=optimize)
 
     def show(self):
         """
@@ -239,6 +265,10 @@ class FontPageTemplate:
     """
     Class representing the template of a FontPage object
     """
+    __slots__ = ('page_height', 'units_number', 'unit',
+                 'header_font_size', 'header_units', 'header_text_position',
+                 'body_font_size', 'body_units', 'body_text_position',
+                 'footer_font_size', 'footer_units', 'footer_text_position')
 
     def __init__(self, page_height=3508, units_number=6):
         """
@@ -249,7 +279,8 @@ class FontPageTemplate:
         """
         # Calculate units
         self.page_height = page_height
-        self.unit = self.page_height // units_number
+        self.units_number = units_number
+        self.unit = self.page_height // self.units_number
         # header
         self.header_font_size = 120
         self.header_units = self.unit
@@ -368,22 +399,28 @@ class FontBooklet:
         """
         return iter(self.pages)
 
-    def save(self, folder, extension='png'):
+    def save(self, folder, extension='png', max_workers=None, compress_level=1):
         """
         Save on each FontPage image
 
         :param folder: path folder where you want to save each font page
         :param extension: extension of imge file. Default is 'png'
+        :param max_workers: number of threads that save the pages. Default is one per page, up to 8.
+        :param compress_level: PNG compression level, from 0 to 9. Default is 1, much faster than 6 for
+            a slightly bigger file; use 6 or 9 for the final booklet.
         :return: None
         """
-        # Define counter page
-        page_counter = 1
         # Check folder path exists
         if not os.path.exists(folder):
             os.makedirs(folder)
-        # Save all page in folder path
-        for page in self:
-            page.save(os.path.join(folder, 'page{0}.{1}'.format(page_counter, extension)))
-            page_counter += 1
+        # Save all page in folder path; image encoding releases the GIL, so pages are saved in parallel
+        if max_workers is None:
+            max_workers = min(8, len(self.pages))
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            list(executor.map(
+                lambda item: item[1].save(os.path.join(folder, 'page{0}.{1}'.format(item[0], extension)),
+                                          compress_level=compress_level),
+                enumerate(self, start=1)
+            ))
 
 # endregion
@@ -22,22 +22,185 @@
 
 # region imports
 import os
-from PIL import Image, ImageDraw, ImageFont
+import io
+import math
+import functools
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+# endregion
+
+# region functions
+def calc_position(name, ixy, fxy):
+    """
+    Calculate the position of a text inside an image
+
+    :param name: name of position; 'center', 'top', 'below', 'rcenter', 'rtop', 'rbelow', 'lcenter', 'ltop'
+        and 'lbelow'. Unknown names are calculated as 'center'.
+    :param ixy: size of image
+    :param fxy: size of text
+    :return: tuple
+    """
+    h, v = _POS.get(name, (1, 1))
+    dx = ixy[0] - fxy[0]
+    dy = ixy[1] - fxy[1]
+    return (0, dx // 2, dx)[h], (0, dy // 2, dy)[v]
+
+
+@functools.lru_cache(maxsize=16)
+def _font_bytes(path):
+    """
+    Read a font file; the result is cached, so each file is read once
+
+    :param path: path of font file
+    :return: bytes
+    """
+    with open(path, 'rb') as font_file:
+        return font_file.read()
+
+
+@functools.lru_cache(maxsize=256)
+def _load_truetype(path, size):
+    """
+    Load a TrueType font object; the result is cached for each path and size
+
+    :param path: path of font file
+    :param size: size of font
+    :return: FreeTypeFont object
+    """
+    # Other font sources, like file objects, are loaded by Pillow
+    if not isinstance(path, (str, os.PathLike)):
+        return ImageFont.truetype(font=path, size=size)
+    font = ImageFont.truetype(font=io.BytesIO(_font_bytes(path)), size=size)
+    # Keep the path of font file, used to load the font with other sizes
+    font.path = path
+    return font
+
+
+@functools.lru_cache(maxsize=64)
+def _get_color(color, mode):
+    """
+    Convert a color name or hex string to a color value of the mode; the result is cached
+
+    :param color: color string
+    :param mode: color system string
+    :return: int or tuple
+    """
+    return ImageColor.getcolor(color, mode)
+
+
+@functools.lru_cache(maxsize=2048)
+def _cached_getbbox(path, size, text):
+    """
+    Get the bounding box of a single line text; the result is cached for each path, size and text
+
+    :param path: path of font file
+    :param size: size of font
+    :param text: text to measure
+    :return: tuple with left, top, right and bottom
+    """
+    return _load_truetype(path, size).getbbox(text)
+
+
+def _get_size(path, size, text):
+    """
+    Get the size of a single line text, from the origin to the bottom right corner of its bounding box
+
+    :param path: path of font file
+    :param size: size of font
+    :param text: text to measure
+    :return: tuple
+    """
+    return _cached_getbbox(path, size, text)[2:]
+
+
+@functools.lru_cache(maxsize=2048)
+def _cached_textsize(path, size, text):
+    """
+    Get the size of a multiline text; the result is cached for each path, size and text
+
+    :param path: path of font file
+    :param size: size of font
+    :param text: text to measure
+    :return: tuple
+    """
+    # Same metrics of ImageDraw.multiline_textsize with default spacing, without an image
+    spacing = 4
+    lines = text.split('\n')
+    line_spacing = _get_size(path, size, 'A')[1] + spacing
+    width = max(_get_size(path, size, line)[0] for line in lines)
+    return width, len(lines) * line_spacing - spacing
+
+
+def _text_mask(path, size, text, align, fontmode):
+    """
+    Render a text into a mask
+
+    :param path: path of font file
+    :param size: size of font
+    :param text: text to render
+    :param align: alignment of text. Available 'left', 'center' and 'right'
+    :param fontmode: font mode of the drawer; '1' or 'L'
+    :return: tuple with offset of mask respect to the text position and mask Image object
+    """
+    font = _load_truetype(path, size)
+    draw = ImageDraw.Draw(Image.new('L', (1, 1)))
+    left, top, right, bottom = draw.textbbox((0, 0), text, font=font, align=align)
+    # Integer offset, so the glyphs are rasterized with the same subpixel position as on the image
+    left, top, right, bottom = math.floor(left), math.floor(top), math.ceil(right), math.ceil(bottom)
+    mask = Image.new('L', (max(right - left, 1), max(bottom - top, 1)))
+    draw = ImageDraw.Draw(mask)
+    draw.fontmode = fontmode
+    draw.text((-left, -top), text, fill=255, font=font, align=align)
+    return (left, top), mask
+
+
+def _fit_font_size(path, initial_size, text, dimension):
+    """
+    Get the largest font size, up to the initial size, whose text fits the dimension
+
+    :param path: path of font file
+    :param initial_size: initial size of font
+    :param text: text to measure
+    :param dimension: dimension where the text must fit
+    :return: int
+    """
+    def fits(size):
+        width, height = _cached_textsize(path, size, text)
+        return width <= dimension[0] and height <= dimension[1]
+
+    # Check font size
+    if fits(initial_size):
+        return initial_size
+    # Search the largest font size that fits the dimension
+    low, high = 1, initial_size - 1
+    while low < high:
+        middle = (low + high + 1) // 2
+        if fits(middle):
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
 
 # endregion
 
 # region variable
-CALC_POSITION = {
-    'center': lambda ixy, fxy: ((ixy[0] - fxy[0]) // 2, (ixy[1] - fxy[1]) // 2),
-    'top': lambda ixy, fxy: ((ixy[0] - fxy[0]) // 2, 0),
-    'below': lambda ixy, fxy: ((ixy[0] - fxy[0]) // 2, (ixy[1] - fxy[1])),
-    'rcenter': lambda ixy, fxy: ((ixy[0] - fxy[0]), (ixy[1] - fxy[1]) // 2),
-    'rtop': lambda ixy, fxy: ((ixy[0] - fxy[0]), 0),
-    'rbelow': lambda ixy, fxy: ((ixy[0] - fxy[0]), (ixy[1] - fxy[1])),
-    'lcenter': lambda ixy, fxy: (0, (ixy[1] - fxy[1]) // 2),
-    'ltop': lambda ixy, fxy: (0, 0),
-    'lbelow': lambda ixy, fxy: (0, (ixy[1] - fxy[1])),
+# Horizontal and vertical mode of each position: 0 is left/top, 1 is center, 2 is right/below
+_POS = {
+    'center': (1, 1),
+    'top': (1, 0),
+    'below': (1, 2),
+    'rcenter': (2, 1),
+    'rtop': (2, 0),
+    'rbelow': (2, 2),
+    'lcenter': (0, 1),
+    'ltop': (0, 0),
+    'lbelow': (0, 2),
 }
+# Position functions by name, kept for compatibility
+CALC_POSITION = {name: functools.partial(calc_position, name) for name in _POS}
+# Maximum number of text masks kept by each FontPreview object
+_TEXT_MASKS_SIZE = 4
 
 
 # endregion
@@ -68,18 +231,20 @@ class FontPreview:
         :param dimension: dimension of preview. Default is 700x327.
         """
         # Define properties
-        self.image = None
+        self._image = None
+        self._dirty = True
+        self._rendered_config = None
+        self._text_masks = {}
         self.font_size = font_size
         self.font_text = font_text
-        self.font = ImageFont.truetype(font=font, size=self.font_size)
+        self.font = _load_truetype(font, self.font_size)
         self.color_system = color_system
         self.bg_image = None
         self.bg_color = bg_color
         self.fg_color = fg_color
         self.dimension = dimension
-        self.font_position = CALC_POSITION['center'](self.dimension, self.font.getsize(self.font_text))
-        # Create default image
-        self.draw()
+        self.font_position = calc_position('center', self.dimension,
+                                           _get_size(self.font.path, self.font.size, self.font_text))
 
     def __str__(self):
         """
@@ -92,19 +257,45 @@ class FontPreview:
             position=self.font_position, dimension=self.dimension
         )
 
-    def __resize(self):
+    @property
+    def image(self):
         """
-        Resize the font if it exceeds the size of the background
+        Image of font preview; it is drawn only when properties have changed
 
+        :return: Image object
+        """
+        if self._dirty:
+            self._render()
+        return self._image
+
+    @image.setter
+    def image(self, image):
+        """
+        Set image of font preview
+
+        :param image: Image object
         :return: None
         """
-        img = ImageDraw.Draw(self.image)
-        # Check font size
-        text_size = img.multiline_textsize(self.font_text, self.font)
-        while text_size > self.dimension:
-            self.font_size = self.font_size - 2
-            self.font = ImageFont.truetype(font=self.font.path, size=self.font_size)
-            text_size = img.multiline_textsize(self.font_text, self.font)
+        self._image = image
+        self._dirty = False
+        self._rendered_config = self._config()
+
+    def _config(self):
+        """
+        Properties that determine the drawn image
+
+        :return: tuple
+        """
+        return (self.font.path, self.font.size, self.font_text, self.dimension, self.font_position,
+                self.color_system, self.bg_image, self.bg_color, self.fg_color)
+
+    def _measure_text(self):
+        """
+        Measure the text with the current font, without drawing
+
+        :return: tuple
+        """
+        return _cached_textsize(self.font.path, self.font.size, self.font_text)
 
     def save(self, path=os.path.join(os.path.abspath(os.getcwd()), 'fontpreview.png')):
         """
@@ -115,21 +306,58 @@ class FontPreview:
         """
         self.image.save(path)
 
-    def draw(self, align='left'):
+    def _render(self, align='left'):
         """
-        Draw image with text based on properties of this object
+        Render image with text based on properties of this object
 
         :param align: alignment of text. Available 'left', 'center' and 'right'
         :return: None
         """
         # Set an image
         if self.bg_image:
-            self.image = Image.open(self.bg_image)
+            self._image = Image.open(self.bg_image)
         # Draw background with flat color
         else:
-            self.image = Image.new(self.color_system, self.dimension, color=self.bg_color)
-        draw = ImageDraw.Draw(self.image)
-        draw.text(self.font_position, self.font_text, fill=self.fg_color, font=self.font, align=align)
+            bg_color = self.bg_color
+            if isinstance(bg_color, str):
+                bg_color = _get_color(bg_color, self.color_system)
+            self._image = Image.new(self.color_system, self.dimension, color=bg_color)
+        draw = ImageDraw.Draw(self._image)
+        x, y = self.font_position
+        if isinstance(x, int) and isinstance(y, int):
+            # Paste the cached text mask with the foreground color, as draw.text does with the mask of each line
+            offset, mask = self.__text_mask(align, draw.fontmode)
+            draw.bitmap((x + offset[0], y + offset[1]), mask, fill=self.fg_color)
+        else:
+            # Subpixel position changes the rasterization of glyphs
+            draw.text(self.font_position, self.font_text, fill=self.fg_color, font=self.font, align=align)
+        self._dirty = False
+        self._rendered_config = self._config()
+
+    def __text_mask(self, align, fontmode):
+        """
+        Get the mask of text; the text is shaped once for each font, text and alignment
+
+        :param align: alignment of text. Available 'left', 'center' and 'right'
+        :param fontmode: font mode of the drawer; '1' or 'L'
+        :return: tuple with offset of mask respect to the text position and mask Image object
+        """
+        key = (self.font.path, self.font.size, self.font_text, align, fontmode)
+        if key not in self._text_masks:
+            # Drop the oldest mask
+            if len(self._text_masks) >= _TEXT_MASKS_SIZE:
+                del self._text_masks[next(iter(self._text_masks))]
+            self._text_masks[key] = _text_mask(*key)
+        return self._text_masks[key]
+
+    def draw(self, align='left'):
+        """
+        Draw image with text based on properties of this object
+
+        :param align: alignment of text. Available 'left', 'center' and 'right'
+        :return: None
+        """
+        self._render(align)
 
     def show(self):
         """
@@ -146,12 +374,7 @@ class FontPreview:
         :param size: size of font
         :return: None
         """
-        # Set size of font
-        self.font_size = size
-        self.font = ImageFont.truetype(font=self.font.path, size=self.font_size)
-        self.__resize()
-        # Create image
-        self.draw()
+        self.reconfigure(font_size=size)
 
     def set_text_position(self, position):
         """
@@ -163,15 +386,33 @@ class FontPreview:
 
         :return: None
         """
-        # Create image drawer
-        img = ImageDraw.Draw(self.image)
-        if isinstance(position, tuple):
-            self.font_position = position
-        else:
-            self.font_position = CALC_POSITION.get(position, CALC_POSITION['center'])(
-                self.dimension, img.multiline_textsize(self.font_text, self.font)
-            )
-        # Create image
-        self.draw()
+        self.reconfigure(text_position=position)
+
+    def reconfigure(self, font_size=None, dimension=None, font_text=None, text_position=None):
+        """
+        Set several properties at once; the image is drawn only once, on next access
+
+        :param font_size: size of font
+        :param dimension: dimension of preview
+        :param font_text: font text representation
+        :param text_position: position of text; a tuple with x and y axis, or a string (see set_text_position)
+        :return: None
+        """
+        if dimension is not None:
+            self.dimension = dimension
+        if font_text is not None:
+            self.font_text = font_text
+        # Set size of font
+        if font_size is not None:
+            self.font_size = _fit_font_size(self.font.path, font_size, self.font_text, self.dimension)
+            self.font = _load_truetype(self.font.path, self.font_size)
+        # Set position of text
+        if isinstance(text_position, tuple):
+            self.font_position = text_position
+        elif text_position is not None:
+            self.font_position = calc_position(text_position, self.dimension, self._measure_text())
+        # Image will be drawn on next access, only if the properties differ from the drawn ones
+        if self._config() != self._rendered_config:
+            self._dirty = True
 
 # endregion
@@ -1,6 +1,9 @@
 import unittest
 import os
+import tempfile
+from PIL import Image, ImageDraw
 from fontpreview import FontPreview, FontBanner, FontLogo, FontWall, FontPage, FontPageTemplate, FontBooklet
+from fontpreview.fontbanner import resize
 
 # Enter the file font to test and check exists
 font = input('Enter path of font file to test: ')
@@ -82,6 +85,11 @@ class TestFontPreview(unittest.TestCase):
         # test resize in add image
         fb_big = FontBanner(font, (2000, 2000))
         self.fb.add_image(fb_big, (500, 500))
+        # test resize of image that exceeds only the height
+        fp_tall = FontPreview(font, dimension=(100, 2000))
+        small = resize(fp_tall.image, self.fb.image)
+        self.assertLessEqual(small.width, self.fb.image.width)
+        self.assertLessEqual(small.height, self.fb.image.height)
 
     def test_font_size(self):
         # Test FontPreview font size
@@ -112,6 +120,40 @@ class TestFontPreview(unittest.TestCase):
         self.assertEqual(fpage.body.font.size, 90)
         self.assertEqual(fpage.footer.font.size, 90)
 
+    def test_font_resize(self):
+        # Test FontPreview font size that exceeds the dimension
+        fp = FontPreview(font, font_text='resize', dimension=(200, 100))
+        fp.set_font_size(500)
+        self.assertLess(fp.font.size, 500)
+        self.assertEqual(fp.font.size, fp.font_size)
+        # Test that the text fits inside the dimension
+        left, top, right, bottom = ImageDraw.Draw(fp.image).multiline_textbbox((0, 0), fp.font_text, fp.font)
+        self.assertLessEqual(right, fp.dimension[0])
+        self.assertLessEqual(bottom, fp.dimension[1])
+
+    def test_reconfigure(self):
+        # Test FontPreview reconfigure
+        fp = FontPreview(font)
+        fp.reconfigure(dimension=(800, 400), font_size=50, font_text='reconfigure', text_position='ltop')
+        self.assertEqual(fp.font.size, 50)
+        self.assertEqual(fp.font_text, 'reconfigure')
+        self.assertEqual(fp.font_position, (0, 0))
+        self.assertEqual(fp.image.size, (800, 400))
+
+    def test_draw_text_mask(self):
+        # Test that the cached text mask draws the same pixels of ImageDraw.text
+        colors = {'RGB': ((51, 153, 193), (253, 194, 45)), 'RGBA': ((51, 153, 193, 255), (253, 194, 45, 128)),
+                  'L': (200, 40), '1': (1, 0), 'P': (3, 200)}
+        for color_system, (bg_color, fg_color) in colors.items():
+            for align in ('left', 'center', 'right'):
+                fp = FontPreview(font, font_text='Lorem ipsum,\nj gyp', color_system=color_system,
+                                 bg_color=bg_color, fg_color=fg_color)
+                fp.draw(align=align)
+                expected = Image.new(color_system, fp.dimension, color=bg_color)
+                ImageDraw.Draw(expected).text(fp.font_position, fp.font_text, fill=fg_color, font=fp.font,
+                                              align=align)
+                self.assertEqual(fp.image.tobytes(), expected.tobytes(), (color_system, align))
+
     def test_text_position(self):
         # Test FontPreview font size
         self.fp.set_text_position('lcenter')
@@ -249,6 +291,41 @@ class TestFontPreview(unittest.TestCase):
         for page in self.book:
             page.draw()
 
+    def test_draw_fontpage_twice(self):
+        # Test that drawing again gives the same page
+        fpage = FontPage(header=FontBanner(font), body=FontBanner(font, bg_color='red'),
+                         footer=FontBanner(font, bg_color='blue'))
+        fpage.draw()
+        first = fpage.page.tobytes()
+        fpage.draw()
+        self.assertEqual(fpage.page.tobytes(), first)
+        # Test that an image added to the header after the draws is shown
+        logo = FontLogo(font, 'Fl', bg_color='red')
+        fpage.header.add_image(logo, (0, 0))
+        fpage.draw()
+        self.assertEqual(fpage.page.getpixel((5, 5)), (255, 0, 0))
+
+    def test_save_fontbooklet(self):
+        with tempfile.TemporaryDirectory() as folder:
+            self.book.save(folder)
+            self.assertEqual(sorted(os.listdir(folder)), ['page1.png', 'page2.png'])
+
+    def test_save_compress_level(self):
+        fpage = FontPage(header=FontBanner(font), body=FontBanner(font), footer=FontBanner(font))
+        fpage.draw()
+        with tempfile.TemporaryDirectory() as folder:
+            # Test FontPage compression levels
+            fast, small = os.path.join(folder, 'fast.png'), os.path.join(folder, 'small.png')
+            fpage.save(fast, compress_level=0)
+            fpage.save(small, compress_level=9, optimize=True)
+            for path in (fast, small):
+                with Image.open(path) as image:
+                    self.assertEqual(image.size, fpage.dimension)
+            self.assertLess(os.path.getsize(small), os.path.getsize(fast))
+            # Test FontBooklet compression level
+            FontBooklet(fpage).save(folder, compress_level=0)
+            self.assertEqual(os.path.getsize(os.path.join(folder, 'page1.png')), os.path.getsize(fast))
+
 
 if __name__ == '__main__':
     unittest.main()